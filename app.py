@@ -2,7 +2,11 @@ import gradio as gr
 import numpy as np
 from scipy.io import wavfile
 from scipy import signal
+from scipy.ndimage import maximum_filter1d, uniform_filter1d
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import math
+import functools
 import os
 import time
 import subprocess
@@ -30,6 +34,255 @@ def setup_audio_libraries():
 # Setup audio libraries
 sf, librosa, AUDIO_LIBS_AVAILABLE = setup_audio_libraries()
 
+# Samples per processing block; small enough that a block's working set stays in L2
+BLOCK_SIZE = 65536
+
+# Optional JIT compilation for the vocal gating stage
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _gate_block(vocal_mix, envelope, threshold, smooth_window, vocals, start, stop):
+        """Gate, box-smooth and apply one block; returns its energy"""
+        n = vocal_mix.shape[0]
+        half = smooth_window // 2
+        
+        # Running counts of open and in-range gate samples in the window
+        opened = 0
+        valid = 0
+        for j in range(start - half, start - half + smooth_window):
+            if 0 <= j < n:
+                valid += 1
+                if envelope[j] > threshold:
+                    opened += 1
+        
+        energy = 0.0
+        for i in range(start, stop):
+            gain = (opened + 0.05 * (valid - opened)) / smooth_window
+            v = vocal_mix[i] * gain
+            vocals[i] = v
+            energy += v * v
+            
+            # Slide the window one sample to the right
+            tail = i - half
+            if tail >= 0:
+                valid -= 1
+                if envelope[tail] > threshold:
+                    opened -= 1
+            head = tail + smooth_window
+            if 0 <= head < n:
+                valid += 1
+                if envelope[head] > threshold:
+                    opened += 1
+        return energy
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _gate_vocals(vocal_mix, envelope, threshold, smooth_window, vocals):
+        """Fused gate, box smoothing and multiply; returns the gated energy"""
+        n = vocal_mix.shape[0]
+        energy = 0.0
+        for b in prange((n + BLOCK_SIZE - 1) // BLOCK_SIZE):
+            start = b * BLOCK_SIZE
+            energy += _gate_block(vocal_mix, envelope, threshold, smooth_window,
+                                  vocals, start, min(start + BLOCK_SIZE, n))
+        return energy
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _soft_limit(vocals, gain, linear):
+        """Apply make-up gain, tanh soft limiting and clipping in place"""
+        if linear:
+            scale = gain * 0.72
+            for i in prange(vocals.shape[0]):
+                vocals[i] *= scale
+        else:
+            for i in prange(vocals.shape[0]):
+                v = math.tanh(vocals[i] * gain * 0.8) * 0.9
+                vocals[i] = min(max(v, -0.95), 0.95)
+else:
+    def _gate_vocals(vocal_mix, envelope, threshold, smooth_window, vocals):
+        """Block-wise gate, box smoothing and multiply; returns the gated energy"""
+        n = len(vocal_mix)
+        half = smooth_window // 2
+        energy = 0.0
+        
+        # Gate scratch reused by every block; float32 so the gate never upcasts the mix
+        span = BLOCK_SIZE + smooth_window - 1
+        open_buf = np.empty(span, dtype=bool)
+        gate_buf = np.empty(span, dtype=np.float32)
+        smooth_buf = np.empty(span, dtype=np.float32)
+        
+        for start in range(0, n, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, n)
+            
+            # Gate the block plus the smoother's reach on either side
+            lo = max(start - half, 0)
+            hi = min(stop + smooth_window - 1 - half, n)
+            is_open = np.greater(envelope[lo:hi], threshold, out=open_buf[:hi - lo])
+            gate = gate_buf[:hi - lo]
+            gate.fill(np.float32(0.05))
+            np.copyto(gate, np.float32(1.0), where=is_open)
+            
+            # Apply smoothing to avoid clicks (O(N) running-sum box filter)
+            if smooth_window > 1:
+                gate = uniform_filter1d(gate, size=smooth_window, mode='constant',
+                                        output=smooth_buf[:hi - lo])
+            
+            block = vocals[start:stop]
+            np.multiply(vocal_mix[start:stop], gate[start - lo:stop - lo], out=block)
+            energy += float(np.dot(block, block))
+        return energy
+    
+    def _soft_limit(vocals, gain, linear):
+        """Apply make-up gain, tanh soft limiting and clipping in place, block by block"""
+        for start in range(0, len(vocals), BLOCK_SIZE):
+            block = vocals[start:start + BLOCK_SIZE]
+            if linear:
+                block *= gain * 0.72
+            else:
+                block *= gain * 0.8
+                np.tanh(block, out=block)
+                block *= 0.9
+                np.clip(block, -0.95, 0.95, out=block)
+
+# Filter designs depend only on the sample rate, so each is designed once per rate
+@functools.lru_cache(maxsize=8)
+def _vocal_sos(sample_rate):
+    """Vocal band-limit filter (100Hz-8kHz) as second-order sections"""
+    nyquist = sample_rate // 2
+    low_cutoff = max(100 / nyquist, 0.01)   # Higher low-cut to remove bass bleed
+    high_cutoff = min(8000 / nyquist, 0.95)  # Lower high-cut to reduce cymbal bleed
+    
+    # Steep high-pass and low-pass cascaded into a single SOS bank
+    # (float32 coefficients keep SciPy from promoting the audio to float64)
+    return np.vstack([
+        signal.butter(6, low_cutoff, btype='high', output='sos'),
+        signal.butter(6, high_cutoff, btype='low', output='sos'),
+    ]).astype(np.float32)
+
+@functools.lru_cache(maxsize=8)
+def _peak_sos(sample_rate):
+    """Vocal presence peak filter as second-order sections, or None above Nyquist"""
+    # Boost vocal formant frequencies (1-3kHz)
+    formant_freq = 2000 / (sample_rate // 2)
+    if formant_freq >= 0.95:
+        return None
+    
+    # Simple peak filter for vocal presence
+    Q = 2.0
+    b_peak, a_peak = signal.iirpeak(formant_freq, Q)
+    return signal.tf2sos(b_peak, a_peak).astype(np.float32)
+
+def _design_lowshelf(freq, gain, sample_rate):
+    """RBJ cookbook low-shelf biquad (slope 1) as a single SOS row"""
+    A = np.sqrt(gain)
+    w0 = 2 * np.pi * freq / sample_rate
+    cos_w0 = np.cos(w0)
+    beta = 2 * np.sqrt(A) * np.sin(w0) / np.sqrt(2)
+    b = [A * ((A + 1) - (A - 1) * cos_w0 + beta),
+         2 * A * ((A - 1) - (A + 1) * cos_w0),
+         A * ((A + 1) - (A - 1) * cos_w0 - beta)]
+    a = [(A + 1) + (A - 1) * cos_w0 + beta,
+         -2 * ((A - 1) + (A + 1) * cos_w0),
+         (A + 1) + (A - 1) * cos_w0 - beta]
+    return np.hstack([b, a]) / a[0]
+
+def _design_highshelf(freq, gain, sample_rate):
+    """RBJ cookbook high-shelf biquad (slope 1) as a single SOS row"""
+    A = np.sqrt(gain)
+    w0 = 2 * np.pi * freq / sample_rate
+    cos_w0 = np.cos(w0)
+    beta = 2 * np.sqrt(A) * np.sin(w0) / np.sqrt(2)
+    b = [A * ((A + 1) + (A - 1) * cos_w0 + beta),
+         -2 * A * ((A - 1) + (A + 1) * cos_w0),
+         A * ((A + 1) + (A - 1) * cos_w0 - beta)]
+    a = [(A + 1) - (A - 1) * cos_w0 + beta,
+         2 * ((A - 1) - (A + 1) * cos_w0),
+         (A + 1) - (A - 1) * cos_w0 - beta]
+    return np.hstack([b, a]) / a[0]
+
+def _design_peaking(freq, gain, sample_rate, Q=1.0):
+    """RBJ cookbook peaking-EQ biquad as a single SOS row"""
+    A = np.sqrt(gain)
+    w0 = 2 * np.pi * freq / sample_rate
+    cos_w0 = np.cos(w0)
+    alpha = np.sin(w0) / (2 * Q)
+    b = [1 + alpha * A, -2 * cos_w0, 1 - alpha * A]
+    a = [1 + alpha / A, -2 * cos_w0, 1 - alpha / A]
+    return np.hstack([b, a]) / a[0]
+
+@functools.lru_cache(maxsize=8)
+def _eq_sos(sample_rate):
+    """Instrumental tone-shaping EQ as one SOS cascade"""
+    nyquist = sample_rate // 2
+    
+    # Boost bass and treble slightly while reducing midrange
+    bands = [
+        (_design_lowshelf, 60, 1.1),
+        (_design_peaking, 250, 0.9),
+        (_design_peaking, 2000, 0.85),
+        (_design_highshelf, 8000, 1.05),
+    ]
+    sections = [design(freq, gain, sample_rate) for design, freq, gain in bands
+                if freq < nyquist * 0.9]
+    return np.array(sections, dtype=np.float32).reshape(-1, 6)
+
+def load_wav(audio_file):
+    """Read a WAV file with scipy, scaling integer PCM to float32"""
+    sample_rate, audio_data = wavfile.read(audio_file)
+    if audio_data.dtype == np.int16:
+        audio_data = audio_data.astype(np.float32) / 32768.0
+    elif audio_data.dtype == np.int32:
+        audio_data = audio_data.astype(np.float32) / 2147483648.0
+    return audio_data, sample_rate
+
+# Vocal envelope analysis rate; the gate only needs the band-limited mix's window peaks
+ANALYSIS_RATE = 22050
+
+def analysis_decimation(sample_rate):
+    """Integer decimation factor that brings sample_rate down to about ANALYSIS_RATE"""
+    return max(sample_rate // ANALYSIS_RATE, 1)
+
+# Staged progress-bar pauses, off unless DEVOX_DEBUG_PROGRESS=1
+_DEBUG_PROGRESS = os.environ.get("DEVOX_DEBUG_PROGRESS") == "1"
+
+# Output files and mid/side scratch buffers are reused across calls, which is only
+# safe because the separate button is wired with concurrency_limit=1. Gradio copies
+# outputs into its own cache, and both files are fully written before separate_audio
+# returns.
+_TMPDIR = tempfile.mkdtemp(prefix='devox_')
+_OUT_INST = os.path.join(_TMPDIR, 'inst.wav')
+_OUT_VOC = os.path.join(_TMPDIR, 'voc.wav')
+_scratch_mid = np.empty(0, dtype=np.float32)
+_scratch_side = np.empty(0, dtype=np.float32)
+
+# Largest scratch pool kept between calls (~10 minutes at 48kHz, 2 x 115MB)
+SCRATCH_MAX_SAMPLES = 30_000_000
+
+def get_scratch_buffers(n):
+    """Return float32 mid/side scratch views of length n, growing the pool up to its cap"""
+    global _scratch_mid, _scratch_side
+    if n > SCRATCH_MAX_SAMPLES:
+        # Longer tracks get per-call buffers that are freed when the call returns
+        return np.empty(n, dtype=np.float32), np.empty(n, dtype=np.float32)
+    if _scratch_mid.size < n:
+        _scratch_mid = np.empty(n, dtype=np.float32)
+        _scratch_side = np.empty(n, dtype=np.float32)
+    return _scratch_mid[:n], _scratch_side[:n]
+
+# Background writer for output files; soundfile releases the GIL while encoding
+_write_executor = ThreadPoolExecutor(max_workers=2)
+
+def save_wav(path, audio, sample_rate):
+    """Write a mono track to a WAV file"""
+    if AUDIO_LIBS_AVAILABLE and sf:
+        sf.write(path, audio, sample_rate)
+    else:
+        wavfile.write(path, sample_rate, (audio * 32767).astype(np.int16))
+
 def separate_audio(audio_file, separation_mode="Both", progress=gr.Progress()):
     """DeVox AI-powered audio separation with improved vocal extraction"""
     if audio_file is None:
@@ -38,197 +291,205 @@ def separate_audio(audio_file, separation_mode="Both", progress=gr.Progress()):
     try:
         # Progress tracking
         progress(0.1, desc="🎵 Loading your audio...")
-        time.sleep(0.5)
+        if _DEBUG_PROGRESS:
+            time.sleep(0.5)
         
         # Read audio file with multi-format support
+        audio_data = None
         if AUDIO_LIBS_AVAILABLE and sf and librosa:
             try:
-                # Use librosa for multi-format support
-                audio_data, sample_rate = librosa.load(audio_file, sr=None, mono=False)
-                
-                # librosa returns (channels, samples) for stereo, we need (samples, channels)
-                if len(audio_data.shape) == 2:
-                    audio_data = audio_data.T
-                
-                audio_data = audio_data.astype(np.float32)
-                print(f"✅ Loaded with librosa: {audio_data.shape}")
+                # soundfile decodes straight to float32 (samples, channels) at the native rate
+                audio_data, sample_rate = sf.read(audio_file, dtype='float32', always_2d=True)
+                print(f"✅ Loaded with soundfile: {audio_data.shape}")
             except Exception as e:
-                print(f"⚠️ Librosa failed, trying scipy: {e}")
-                # Fallback to scipy
-                sample_rate, audio_data = wavfile.read(audio_file)
-                if audio_data.dtype == np.int16:
-                    audio_data = audio_data.astype(np.float32) / 32768.0
-                elif audio_data.dtype == np.int32:
-                    audio_data = audio_data.astype(np.float32) / 2147483648.0
-        else:
+                print(f"⚠️ Soundfile failed, trying librosa: {e}")
+                try:
+                    # Use librosa for formats soundfile cannot open
+                    audio_data, sample_rate = librosa.load(audio_file, sr=None, mono=False)
+                    
+                    # librosa returns (channels, samples) for stereo, we need (samples, channels)
+                    if len(audio_data.shape) == 2:
+                        audio_data = audio_data.T
+                    
+                    if audio_data.dtype != np.float32:
+                        audio_data = audio_data.astype(np.float32, copy=False)
+                    print(f"✅ Loaded with librosa: {audio_data.shape}")
+                except Exception as e:
+                    print(f"⚠️ Librosa failed, trying scipy: {e}")
+        
+        if audio_data is None:
             # WAV-only mode with scipy
-            sample_rate, audio_data = wavfile.read(audio_file)
-            if audio_data.dtype == np.int16:
-                audio_data = audio_data.astype(np.float32) / 32768.0
-            elif audio_data.dtype == np.int32:
-                audio_data = audio_data.astype(np.float32) / 2147483648.0
+            audio_data, sample_rate = load_wav(audio_file)
         
         progress(0.3, desc="🔍 Analyzing audio spectrum...")
-        time.sleep(0.5)
+        if _DEBUG_PROGRESS:
+            time.sleep(0.5)
         
         # Handle mono/stereo conversion
-        if len(audio_data.shape) == 1:
-            # For mono files, create artificial stereo
-            stereo_data = np.stack([audio_data, audio_data], axis=1)
+        if audio_data.ndim == 2 and audio_data.shape[1] == 1:
+            audio_data = audio_data[:, 0]
+        is_mono = len(audio_data.shape) == 1
+        if is_mono:
+            # For mono files, use the same samples as both channels (no stacked copy)
+            left_channel = right_channel = audio_data
         else:
-            stereo_data = audio_data[:, :2] if audio_data.shape[1] > 2 else audio_data
+            # Column views; any channels beyond the first two are ignored
+            left_channel = audio_data[:, 0]
+            right_channel = audio_data[:, 1]
+        
+        # Only compute what the selected mode returns
+        want_vocals = separation_mode in ["Both", "Vocals Only"]
+        want_instrumental = separation_mode in ["Both", "Instrumental Only"]
         
         progress(0.6, desc="🤖 AI separation in progress...")
-        time.sleep(0.8)
+        if _DEBUG_PROGRESS:
+            time.sleep(0.8)
         
-        left_channel = stereo_data[:, 0]
-        right_channel = stereo_data[:, 1]
+        # Side signal shared by both branches, computed once into reused scratch
+        # (identically zero for mono input, so it is skipped there)
+        mid, side = get_scratch_buffers(len(left_channel))
+        if not is_mono:
+            np.subtract(left_channel, right_channel, out=side)
+            side *= 0.5
         
         # Improved separation algorithms
-        if separation_mode in ["Both", "Vocals Only"]:
+        if want_vocals and is_mono:
+            # No side signal, so the vocal chain would only produce silence
+            vocals = np.zeros(len(left_channel), dtype=np.float32)
+        elif want_vocals:
             # Multi-method vocal extraction approach
             
-            # Method 1: Basic center extraction with phase adjustment
-            center_vocals = (left_channel - right_channel)
-            
-            # Method 2: Enhanced spectral processing
-            # Apply vocal-specific frequency filtering (100Hz-8kHz for better clarity)
-            nyquist = sample_rate // 2
-            low_cutoff = max(100 / nyquist, 0.01)   # Higher low-cut to remove bass bleed
-            high_cutoff = min(8000 / nyquist, 0.95)  # Lower high-cut to reduce cymbal bleed
-            
-            # More aggressive filtering for vocal isolation
-            b_high, a_high = signal.butter(6, low_cutoff, btype='high')  # Steeper filter
-            b_low, a_low = signal.butter(6, high_cutoff, btype='low')
-            
-            center_vocals_filtered = signal.filtfilt(b_high, a_high, center_vocals)
-            center_vocals_filtered = signal.filtfilt(b_low, a_low, center_vocals_filtered)
+            # Method 1 & 2: Center extraction with vocal band-limiting
+            # L - R is twice the side signal, so filter side and fold the scale into the weight
+            vocal_mix = signal.sosfiltfilt(_vocal_sos(sample_rate), side).astype(np.float32, copy=False)
+            vocal_mix *= 0.6
             
             # Method 3: Mid-side processing for better vocal isolation
-            # Convert to mid-side
-            mid = (left_channel + right_channel) * 0.5
-            side = (left_channel - right_channel) * 0.5
-            
             # Enhance side channel (where vocals often reside after center removal)
-            side_enhanced = side * 2.5
-            
             # Apply vocal-specific EQ to enhance presence
-            # Boost vocal formant frequencies (1-3kHz)
-            formant_freq = 2000 / nyquist
-            if formant_freq < 0.95:
-                # Simple peak filter for vocal presence
-                Q = 2.0
-                b_peak, a_peak = signal.iirpeak(formant_freq, Q)
-                side_enhanced = signal.filtfilt(b_peak, a_peak, side_enhanced)
+            sos_peak = _peak_sos(sample_rate)
+            if sos_peak is not None:
+                side_enhanced = signal.sosfiltfilt(sos_peak, side).astype(np.float32, copy=False)
+                side_enhanced *= 1.75
+            else:
+                side_enhanced = side * 1.75
             
             # Method 4: Combine approaches with intelligent weighting
-            # Weight based on frequency content
-            vocal_mix = center_vocals_filtered * 0.3 + side_enhanced * 0.7
+            # 0.3 * center + 0.7 * (2.5 * side), accumulated in place
+            vocal_mix += side_enhanced
             
             # Method 5: Advanced dynamic processing
-            # Calculate envelope for dynamic gating
+            # Calculate envelope for dynamic gating on the decimated analysis signal
+            # (frames keep their full-rate window and hop; only the peak search is decimated)
             window_size = int(sample_rate * 0.05)  # 50ms windows
-            envelope = []
-            
-            for i in range(0, len(vocal_mix) - window_size, window_size // 4):
-                window = vocal_mix[i:i+window_size]
-                env = np.max(np.abs(window))
-                envelope.extend([env] * (window_size // 4))
-            
-            # Pad envelope to match audio length
-            while len(envelope) < len(vocal_mix):
-                envelope.append(envelope[-1] if envelope else 0)
-            envelope = np.array(envelope[:len(vocal_mix)])
+            hop_size = window_size // 4
+            down = analysis_decimation(sample_rate)
+            abs_mix = np.abs(vocal_mix)
+            abs_analysis = abs_mix[::down]
+            
+            # Peak of each 50ms window, held for one hop (running max filter, no Python loop)
+            n_frames = len(range(0, len(vocal_mix) - window_size, hop_size))
+            if n_frames > 0:
+                analysis_window = window_size // down
+                window_max = maximum_filter1d(abs_analysis, analysis_window,
+                                              origin=-(analysis_window // 2))
+                env_frames = window_max[np.arange(n_frames) * hop_size // down]
+                envelope = np.repeat(env_frames, hop_size)[:len(vocal_mix)]
+                
+                # Pad envelope to match audio length
+                pad = len(vocal_mix) - len(envelope)
+                envelope = np.pad(envelope, (0, pad), mode='edge')
+                
+                # Mean of the held envelope, taken from the frames rather than all samples
+                # (the last frame is trimmed or extended to reach the audio length)
+                tail = len(vocal_mix) - n_frames * hop_size
+                held_sum = float(env_frames.sum()) * hop_size + tail * float(env_frames[-1])
+                signal_energy = held_sum / len(vocal_mix)
+            else:
+                envelope = np.zeros(len(vocal_mix), dtype=np.float32)
+                signal_energy = 0.0
             
             # Adaptive threshold based on signal characteristics
-            signal_energy = np.mean(envelope)
             adaptive_threshold = signal_energy * 0.2
             
-            # Smooth gating with hysteresis
-            gate = np.where(envelope > adaptive_threshold, 1.0, 0.05)
-            
-            # Apply smoothing to avoid clicks
+            # Smooth gating with hysteresis, block by block with energy and peak tracking
             smooth_window = int(sample_rate * 0.005)  # 5ms smoothing
-            if smooth_window > 1:
-                gate = np.convolve(gate, np.ones(smooth_window)/smooth_window, mode='same')
-            
-            vocals = vocal_mix * gate
+            vocals = np.empty_like(vocal_mix)
+            vocals_energy = _gate_vocals(vocal_mix, envelope, adaptive_threshold,
+                                         max(smooth_window, 1), vocals)
+            vocals_rms = math.sqrt(vocals_energy / len(vocals))
             
             # Method 6: Final enhancement and limiting
             # Gentle compression for vocal clarity
-            vocals_rms = np.sqrt(np.mean(vocals**2))
+            compression_ratio = 1.0
             if vocals_rms > 0:
                 target_rms = 0.1
                 compression_ratio = np.clip(target_rms / vocals_rms, 0.5, 2.0)
-                vocals *= compression_ratio
             
             # Soft limiting to prevent distortion
-            vocals = np.tanh(vocals * 0.8) * 0.9
-            vocals = np.clip(vocals, -0.95, 0.95)
+            # The gate never exceeds 1, so the mix peak bounds the gated peak; below
+            # this bound tanh(u) is within 0.4% of u and the clip cannot trigger, so a
+            # plain gain replaces the transcendental pass
+            vocals_peak = float(abs_mix.max()) if len(abs_mix) else 0.0
+            linear_limit = vocals_peak * compression_ratio * 0.8 < 0.1
+            _soft_limit(vocals, compression_ratio, linear_limit)
             
         else:
-            vocals = np.zeros_like(left_channel)
+            vocals = None
         
-        if separation_mode in ["Both", "Instrumental Only"]:
+        if want_instrumental:
             # Enhanced instrumental extraction
             
             # Method 1: Improved center channel removal
-            sum_channels = (left_channel + right_channel) * 0.5
+            np.add(left_channel, right_channel, out=mid)
+            mid *= 0.5
             
             # Method 2: Preserve stereo width while removing center
-            # Calculate the difference signal for stereo information
-            stereo_diff = (left_channel - right_channel) * 0.3
-            
-            # Combine sum with reduced difference to maintain some stereo feel
-            instrumental = sum_channels + np.roll(stereo_diff, int(sample_rate * 0.001))  # 1ms delay for width
+            instrumental = mid
+            if not is_mono:
+                # Calculate the difference signal for stereo information
+                # (side is not needed after this point, so scale it in place)
+                stereo_diff = np.multiply(side, 0.6, out=side)
+                
+                # Combine sum with reduced difference to maintain some stereo feel
+                # 1ms delay for width, added as a shifted slice rather than a rolled copy
+                delay = int(sample_rate * 0.001)
+                instrumental[delay:] += stereo_diff[:len(stereo_diff) - delay]
             
             # Method 3: Frequency-dependent processing
-            # Apply gentle EQ to enhance instrumental elements
-            # Boost bass and treble slightly while reducing midrange
-            frequencies = [60, 250, 2000, 8000]  # Hz
-            gains = [1.1, 0.9, 0.85, 1.05]  # Gain factors
-            
-            instrumental_eq = instrumental.copy()
-            for freq, gain in zip(frequencies, gains):
-                # Simple shelving filters
-                if freq < nyquist * 0.9:
-                    cutoff = freq / nyquist
-                    if freq < 500:  # Low shelf
-                        b, a = signal.butter(2, cutoff, btype='low')
-                        low_component = signal.filtfilt(b, a, instrumental)
-                        instrumental_eq += (gain - 1) * low_component * 0.3
-                    elif freq > 4000:  # High shelf
-                        b, a = signal.butter(2, cutoff, btype='high')
-                        high_component = signal.filtfilt(b, a, instrumental)
-                        instrumental_eq += (gain - 1) * high_component * 0.3
+            # Apply gentle EQ to enhance instrumental elements in a single SOS pass
+            sos_eq = _eq_sos(sample_rate)
+            if len(sos_eq):
+                instrumental = signal.sosfilt(sos_eq, instrumental).astype(np.float32, copy=False)
             
-            instrumental = np.clip(instrumental_eq * 0.95, -1, 1)
+            instrumental *= 0.95
+            np.clip(instrumental, -1, 1, out=instrumental)
             
         else:
-            instrumental = np.zeros_like(left_channel)
+            instrumental = None
         
         progress(0.9, desc="🎚️ Optimizing audio quality...")
-        time.sleep(0.3)
+        if _DEBUG_PROGRESS:
+            time.sleep(0.3)
         
-        # Save outputs based on mode
+        # Save outputs based on mode, writing both files concurrently
         instrumental_path = None
         vocal_path = None
+        pending_writes = []
+        
+        if want_instrumental:
+            instrumental_path = _OUT_INST
+            pending_writes.append(
+                _write_executor.submit(save_wav, instrumental_path, instrumental, sample_rate))
         
-        if separation_mode in ["Both", "Instrumental Only"]:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f_inst:
-                if AUDIO_LIBS_AVAILABLE and sf:
-                    sf.write(f_inst.name, instrumental, sample_rate)
-                else:
-                    wavfile.write(f_inst.name, sample_rate, (instrumental * 32767).astype(np.int16))
-                instrumental_path = f_inst.name
+        if want_vocals:
+            vocal_path = _OUT_VOC
+            pending_writes.append(
+                _write_executor.submit(save_wav, vocal_path, vocals, sample_rate))
         
-        if separation_mode in ["Both", "Vocals Only"]:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f_vocal:
-                if AUDIO_LIBS_AVAILABLE and sf:
-                    sf.write(f_vocal.name, vocals, sample_rate)
-                else:
-                    wavfile.write(f_vocal.name, sample_rate, (vocals * 32767).astype(np.int16))
-                vocal_path = f_vocal.name
+        # Wait for the writes to land (re-raises any write error)
+        for write in pending_writes:
+            write.result()
         
         progress(1.0, desc="✨ Professional separation complete!")
         
@@ -721,7 +982,8 @@ with gr.Blocks(
         fn=separate_audio,
         inputs=[audio_input, separation_mode],
         outputs=[instrumental_output, vocal_output, status_output],
-        show_progress=True
+        show_progress=True,
+        concurrency_limit=1  # separate_audio reuses module-level output files and scratch buffers
     )
 
 if __name__ == "__main__":